@@ -1,14 +1,19 @@
 import typing as t
 import os
-import rich
-from rich.table import Table
+import re
+import sys
+import json
+import textwrap
+import functools
 import datetime
 import sqlite3
 import dataclasses
 import argparse
-import configparser
 import pathlib
 
+if t.TYPE_CHECKING:
+    from rich.table import Table
+
 
 class JireError(Exception): ...
 
@@ -21,7 +26,16 @@ def adapt_datetime_epoch(val: datetime.datetime) -> int:
     return int(val.timestamp())
 
 
+def convert_epoch_datetime(val: bytes) -> datetime.datetime:
+    """Convert Unix timestamp to datetime.datetime."""
+    return datetime.datetime.fromtimestamp(int(val))
+
+
 sqlite3.register_adapter(datetime.datetime, adapt_datetime_epoch)
+sqlite3.register_converter("timestamp", convert_epoch_datetime)
+
+
+SCHEMA_VERSION = 3
 
 
 RETURNING_CLAUSE = """
@@ -40,6 +54,52 @@ RETURNING
 """
 
 
+SQL_SELECT_TICKET = """
+SELECT
+    rowid,
+    name,
+    description,
+    project,
+    status,
+    assigned_to,
+    notes,
+    created_by,
+    updated_by,
+    created_at,
+    updated_at
+FROM ticket
+WHERE rowid = :rowid
+"""
+
+SQL_INSERT_TICKET = """
+INSERT INTO ticket (name, description, project, status, assigned_to, created_by, created_at)
+VALUES (:name, :description, :project, :status, :assigned_to, :created_by, :created_at)
+"""
+
+SQL_UPDATE_ASSIGN = """
+UPDATE ticket SET
+    status = :status,
+    assigned_to = :assigned_to,
+    updated_by = :updated_by,
+    updated_at = :updated_at
+WHERE rowid = :rowid
+"""
+
+SQL_UPDATE_DONE = """
+UPDATE ticket SET
+    status = :status,
+    notes = :notes,
+    assigned_to = NULL,
+    updated_by = :updated_by,
+    updated_at = :updated_at
+WHERE rowid = :rowid
+"""
+
+SQL_INSERT_TICKET_RETURNING = SQL_INSERT_TICKET + RETURNING_CLAUSE
+SQL_UPDATE_ASSIGN_RETURNING = SQL_UPDATE_ASSIGN + RETURNING_CLAUSE
+SQL_UPDATE_DONE_RETURNING = SQL_UPDATE_DONE + RETURNING_CLAUSE
+
+
 @dataclasses.dataclass
 class Ticket:
     """Models a ticket."""
@@ -64,65 +124,19 @@ class Ticket:
     @classmethod
     def get(cls, conn: sqlite3.Connection, rowid: int) -> t.Self:
         """Get a ticket by rowid."""
-        sql = """
-        SELECT
-            rowid,
-            name,
-            description,
-            project,
-            status,
-            assigned_to,
-            notes,
-            created_by,
-            updated_by,
-            created_at,
-            updated_at
-        FROM ticket
-        WHERE rowid = :rowid
-        """
         params = {
             "rowid": rowid,
         }
         with conn:
-            conn.row_factory = cls.row_factory
-            cursor = conn.execute(sql, params)
+            cursor = conn.execute(SQL_SELECT_TICKET, params)
             ticket = cursor.fetchone()
         return ticket
 
     @classmethod
     def row_factory(cls, cursor: sqlite3.Cursor, row: tuple[t.Any, ...]) -> t.Self:
         """Sqlite row factory for the Ticket class."""
-        headers = [v[0] for v in cursor.description]
-        raw_data = dict(zip(headers, row))
-        rowid = raw_data["rowid"]
-        name = raw_data["name"]
-        description = raw_data["description"]
-        project = raw_data["project"]
-        status = raw_data["status"]
-        assigned_to = raw_data["assigned_to"]
-        notes = raw_data["notes"]
-        created_by = raw_data["created_by"]
-        created_at = raw_data["created_at"]
-        updated_by = raw_data["updated_by"]
-        updated_at = raw_data["updated_at"]
-        created_at = datetime.datetime.fromtimestamp(created_at)
-
-        if updated_at:
-            updated_at = datetime.datetime.fromtimestamp(updated_at)
-
-        return cls(
-            rowid=rowid,
-            name=name,
-            description=description,
-            project=project,
-            status=status,
-            assigned_to=assigned_to,
-            notes=notes,
-            created_by=created_by,
-            updated_by=updated_by,
-            created_at=created_at,
-            updated_at=updated_at,
-        )
+        # Queries select columns in field order, timestamps are converted on fetch
+        return cls(*row)
 
     @classmethod
     def new(
@@ -133,14 +147,10 @@ class Ticket:
         project: str,
         assigned_to: str | None,
         created_by: str,
-        current_datetime: datetime.datetime,
-    ) -> t.Self:
+        current_epoch: int,
+        returning: bool = True,
+    ) -> t.Self | None:
         """Create a new ticket."""
-        sql = f"""
-        INSERT INTO ticket (name, description, project, status, assigned_to, created_by, created_at)
-        VALUES (:name, :description, :project, :status, :assigned_to, :created_by, :created_at)
-        {RETURNING_CLAUSE}
-        """
         params = {
             "name": name,
             "status": Ticket.TODO,
@@ -148,11 +158,16 @@ class Ticket:
             "project": project,
             "assigned_to": assigned_to,
             "created_by": created_by,
-            "created_at": current_datetime,
+            "created_at": current_epoch,
         }
+
+        if not returning:
+            with conn:
+                conn.execute(SQL_INSERT_TICKET, params)
+            return None
+
         with conn:
-            conn.row_factory = cls.row_factory
-            cursor = conn.execute(sql, params)
+            cursor = conn.execute(SQL_INSERT_TICKET_RETURNING, params)
             ticket = cursor.fetchone()
         return ticket
 
@@ -187,46 +202,23 @@ class Ticket:
             "updated_at": updated_at,
         }
 
-    def add_to_table(self, table: Table) -> None:
+    def add_to_table(self, table: "Table") -> None:
         """Add the ticket to a rich Table."""
-        rowid = f"{self.rowid}"
-        name = f"{self.name}"
-        description = f"{self.description}"
-        project = f"{self.project}"
-        status = f"{self.status}"
-        created_by = f"{self.created_by}"
-        created_at = f"{self.created_at.isoformat()}"
-
-        if self.notes:
-            notes = f"{self.notes}"
-        else:
-            notes = ""
-
-        if self.assigned_to:
-            assigned_to = f"{self.assigned_to}"
-        else:
-            assigned_to = ""
-
-        if self.updated_by:
-            updated_by = f"{self.updated_by}"
-        else:
-            updated_by = ""
-
-        if self.updated_at:
-            updated_at = f"{self.updated_at.isoformat()}"
-        else:
-            updated_at = ""
+        notes = self.notes if self.notes else ""
+        assigned_to = self.assigned_to if self.assigned_to else ""
+        updated_by = self.updated_by if self.updated_by else ""
+        updated_at = self.updated_at.isoformat() if self.updated_at else ""
 
         table.add_row(
-            rowid,
-            name,
-            description,
-            project,
-            status,
+            str(self.rowid),
+            self.name,
+            self.description,
+            self.project,
+            self.status,
             assigned_to,
             notes,
-            created_by,
-            created_at,
+            self.created_by,
+            self.created_at.isoformat(),
             updated_by,
             updated_at,
         )
@@ -237,28 +229,25 @@ class Ticket:
         status: str,
         assigned_to: str | None,
         updated_by: str,
-        current_datetime: datetime.datetime,
-    ) -> t.Self:
+        current_epoch: int,
+        returning: bool = True,
+    ) -> t.Self | None:
         """Assign the the ticket to a user."""
-        sql = f"""
-        UPDATE ticket SET
-            status = :status,
-            assigned_to = :assigned_to,
-            updated_by = :updated_by,
-            updated_at = :updated_at
-        WHERE rowid = :rowid
-        {RETURNING_CLAUSE}
-        """
         params = {
             "rowid": self.rowid,
             "status": status,
             "assigned_to": assigned_to,
             "updated_by": updated_by,
-            "updated_at": current_datetime,
+            "updated_at": current_epoch,
         }
+
+        if not returning:
+            with conn:
+                conn.execute(SQL_UPDATE_ASSIGN, params)
+            return None
+
         with conn:
-            conn.row_factory = self.row_factory
-            cursor = conn.execute(sql, params)
+            cursor = conn.execute(SQL_UPDATE_ASSIGN_RETURNING, params)
             ticket = cursor.fetchone()
         return ticket
 
@@ -267,35 +256,36 @@ class Ticket:
         conn: sqlite3.Connection,
         notes: str,
         updated_by: str,
-        current_datetime: datetime.datetime,
-    ) -> t.Self:
+        current_epoch: int,
+        returning: bool = True,
+    ) -> t.Self | None:
         """Mark the ticket as done."""
-        sql = f"""
-        UPDATE ticket SET
-            status = :status,
-            notes = :notes,
-            assigned_to = NULL,
-            updated_by = :updated_by,
-            updated_at = :updated_at
-        WHERE rowid = :rowid
-        {RETURNING_CLAUSE}
-        """
         params = {
             "rowid": self.rowid,
             "notes": notes,
             "status": Ticket.DONE,
             "updated_by": updated_by,
-            "updated_at": current_datetime,
+            "updated_at": current_epoch,
         }
+
+        if not returning:
+            with conn:
+                conn.execute(SQL_UPDATE_DONE, params)
+            return None
+
         with conn:
-            conn.row_factory = self.row_factory
-            cursor = conn.execute(sql, params)
+            cursor = conn.execute(SQL_UPDATE_DONE_RETURNING, params)
             ticket = cursor.fetchone()
         return ticket
 
 
 def setup_db(conn: sqlite3.Connection) -> None:
     """Setup the database."""
+    (user_version,) = conn.execute("PRAGMA user_version").fetchone()
+
+    if user_version == SCHEMA_VERSION:
+        return
+
     sql = """
     CREATE TABLE IF NOT EXISTS ticket (
         name text,
@@ -309,11 +299,12 @@ def setup_db(conn: sqlite3.Connection) -> None:
         updated_by text NULL,
         updated_at timestamp NULL
     );
-    """
-    with conn:
-        conn.execute(sql)
 
-    sql = """
+    CREATE INDEX IF NOT EXISTS ix_ticket_status ON ticket (status);
+    CREATE INDEX IF NOT EXISTS ix_ticket_assigned_to ON ticket (assigned_to)
+        WHERE assigned_to IS NOT NULL;
+    CREATE INDEX IF NOT EXISTS ix_ticket_created_by ON ticket (created_by);
+
     CREATE VIRTUAL TABLE IF NOT EXISTS ticket_fts USING fts5(
         name,
         description,
@@ -325,11 +316,7 @@ def setup_db(conn: sqlite3.Connection) -> None:
         content=ticket,
         content_rowid=rowid
     );
-    """
-    with conn:
-        conn.execute(sql)
 
-    sql = """
     CREATE TRIGGER IF NOT EXISTS insert_ticket AFTER INSERT ON ticket
     BEGIN
         INSERT INTO ticket_fts (
@@ -339,7 +326,7 @@ def setup_db(conn: sqlite3.Connection) -> None:
             project,
             status,
             assigned_to,
-            created_by   
+            created_by
         )
         VALUES (
             NEW.rowid,
@@ -351,14 +338,36 @@ def setup_db(conn: sqlite3.Connection) -> None:
             NEW.created_by
         );
     END;
-    """
-    with conn:
-        conn.execute(sql)
 
-    sql = """
-    CREATE TRIGGER IF NOT EXISTS update_ticket AFTER UPDATE ON ticket
+    DROP TRIGGER IF EXISTS update_ticket;
+    CREATE TRIGGER update_ticket AFTER UPDATE ON ticket
+    WHEN OLD.name IS NOT NEW.name
+        OR OLD.description IS NOT NEW.description
+        OR OLD.project IS NOT NEW.project
+        OR OLD.status IS NOT NEW.status
+        OR OLD.assigned_to IS NOT NEW.assigned_to
+        OR OLD.created_by IS NOT NEW.created_by
     BEGIN
-        DELETE FROM ticket_fts WHERE rowid = NEW.rowid;
+        INSERT INTO ticket_fts (
+            ticket_fts,
+            rowid,
+            name,
+            description,
+            project,
+            status,
+            assigned_to,
+            created_by
+        )
+        VALUES (
+            'delete',
+            OLD.rowid,
+            OLD.name,
+            OLD.description,
+            OLD.project,
+            OLD.status,
+            OLD.assigned_to,
+            OLD.created_by
+        );
         INSERT INTO ticket_fts (
             rowid,
             name,
@@ -366,7 +375,7 @@ def setup_db(conn: sqlite3.Connection) -> None:
             project,
             status,
             assigned_to,
-            created_by   
+            created_by
         )
         VALUES (
             NEW.rowid,
@@ -378,16 +387,21 @@ def setup_db(conn: sqlite3.Connection) -> None:
             NEW.created_by
         );
     END;
+
+    -- Earlier versions of update_ticket could leave stale entries in the index
+    INSERT INTO ticket_fts (ticket_fts) VALUES ('rebuild');
     """
     with conn:
-        conn.execute(sql)
+        conn.executescript(
+            f"BEGIN; {sql} PRAGMA user_version = {SCHEMA_VERSION}; COMMIT;"
+        )
 
 
 def list_ticket_handler(
     args: argparse.Namespace,
     conn: sqlite3.Connection,
-    user: str,
-    current_datetime: datetime.datetime,
+    user: t.Callable[[], str],
+    current_epoch: int,
     config: dict[str, str],
 ) -> None:
     """List the available tickets according to the search criteria."""
@@ -407,16 +421,14 @@ def list_ticket_handler(
     )
 
 
-def _list_tickets(
-    conn: sqlite3.Connection,
-    status: str,
-    search: str,
-    assigned_to: str,
-    created_by: str,
-    format: str,
-) -> None:
-    """Print the lsit of tickets."""
-    params = {}
+def _build_list_sql(
+    search: bool,
+    status: bool,
+    assigned_to: bool,
+    created_by: bool,
+    limit: bool,
+) -> str:
+    """Build the list tickets SQL for a combination of filters."""
     sql = """
     SELECT
         t.rowid,
@@ -427,15 +439,13 @@ def _list_tickets(
         t.assigned_to,
         t.notes,
         t.created_by,
-        t.created_at,
         t.updated_by,
+        t.created_at,
         t.updated_at
     FROM ticket t
     """
 
     if search:
-        params["search"] = search
-
         sql += """
             INNER JOIN ticket_fts ON ticket_fts.rowid  = t.rowid
                 AND ticket_fts MATCH :search
@@ -445,48 +455,112 @@ def _list_tickets(
 
     if status:
         sql += "    AND t.status = :status"
-        params["status"] = status
 
     if assigned_to:
         sql += "    AND t.assigned_to = :assigned_to"
-        params["assigned_to"] = assigned_to
 
     if created_by:
         sql += "    AND t.created_by = :created_by"
-        params["created_by"] = created_by
 
-    with conn:
-        conn.row_factory = Ticket.row_factory
-        cursor = conn.execute(sql, params)
-        tickets = cursor.fetchall()
+    if limit:
+        sql += " ORDER BY t.rowid DESC LIMIT :limit"
 
-    if format == "json":
-        rich.print_json(data=[ticket.asdict() for ticket in tickets])
+    return sql
+
+
+# Keyed by a bitmask of the active filters so the SQL text is stable per
+# combination and hits the sqlite3 statement cache.
+LIST_SQL = {
+    mask: _build_list_sql(
+        search=bool(mask & 0b01000),
+        status=bool(mask & 0b00100),
+        assigned_to=bool(mask & 0b00010),
+        created_by=bool(mask & 0b00001),
+        limit=bool(mask & 0b10000),
+    )
+    for mask in range(0b100000)
+}
+
+# Number of tickets shown after a ticket is created or updated
+RECENT_TICKETS_LIMIT = 50
+
+
+def _print_json_tickets(tickets: t.Iterable[Ticket]) -> None:
+    """Print the tickets as a JSON array, serializing one ticket at a time."""
+    separator = "[\n"
+
+    for ticket in tickets:
+        data = json.dumps(ticket.asdict(), indent=2, ensure_ascii=False)
+        sys.stdout.write(separator)
+        sys.stdout.write(textwrap.indent(data, "  "))
+        separator = ",\n"
+
+    if separator == "[\n":
+        sys.stdout.write("[]\n")
     else:
-        table = Table(title="Tickets")
-        table.add_column("rowid")
-        table.add_column("name")
-        table.add_column("description")
-        table.add_column("project")
-        table.add_column("status")
-        table.add_column("assigned_to")
-        table.add_column("notes")
-        table.add_column("created_by")
-        table.add_column("created_at")
-        table.add_column("updated_by")
-        table.add_column("updated_at")
-
-        for ticket in tickets:
+        sys.stdout.write("\n]\n")
+
+
+def _list_tickets(
+    conn: sqlite3.Connection,
+    status: str,
+    search: str,
+    assigned_to: str,
+    created_by: str,
+    format: str,
+    limit: int | None = None,
+) -> None:
+    """Print the lsit of tickets."""
+    mask = (
+        (limit is not None) << 4
+        | bool(search) << 3
+        | bool(status) << 2
+        | bool(assigned_to) << 1
+        | bool(created_by)
+    )
+    sql = LIST_SQL[mask]
+    params = {
+        "search": search,
+        "status": status,
+        "assigned_to": assigned_to,
+        "created_by": created_by,
+        "limit": limit,
+    }
+
+    if format == "json":
+        with conn:
+            _print_json_tickets(tickets=conn.execute(sql, params))
+        return
+
+    # Importing rich is slow, only pay for it when rendering the table
+    import rich
+    from rich.table import Table
+
+    table = Table(title="Tickets")
+    table.add_column("rowid")
+    table.add_column("name")
+    table.add_column("description")
+    table.add_column("project")
+    table.add_column("status")
+    table.add_column("assigned_to")
+    table.add_column("notes")
+    table.add_column("created_by")
+    table.add_column("created_at")
+    table.add_column("updated_by")
+    table.add_column("updated_at")
+
+    with conn:
+        for ticket in conn.execute(sql, params):
             ticket.add_to_table(table=table)
 
-        rich.print(table)
+    rich.print(table)
 
 
 def create_ticket_handler(
     args: argparse.Namespace,
     conn: sqlite3.Connection,
-    user: str,
-    current_datetime: datetime.datetime,
+    user: t.Callable[[], str],
+    current_epoch: int,
     config: dict[str, str],
 ) -> None:
     """Create a new ticket."""
@@ -498,7 +572,7 @@ def create_ticket_handler(
     if args.assign_to:
         assigned_to = args.assign_to
     else:
-        assigned_to = user
+        assigned_to = user()
 
     Ticket.new(
         conn=conn,
@@ -506,8 +580,9 @@ def create_ticket_handler(
         description=description,
         project=project,
         assigned_to=assigned_to,
-        created_by=user,
-        current_datetime=current_datetime,
+        created_by=user(),
+        current_epoch=current_epoch,
+        returning=False,
     )
     _list_tickets(
         conn=conn,
@@ -516,14 +591,15 @@ def create_ticket_handler(
         assigned_to="",
         created_by="",
         format=format,
+        limit=RECENT_TICKETS_LIMIT,
     )
 
 
 def assign_todo_handler(
     args: argparse.Namespace,
     conn: sqlite3.Connection,
-    user: str,
-    current_datetime: datetime.datetime,
+    user: t.Callable[[], str],
+    current_epoch: int,
     config: dict[str, str],
 ) -> None:
     """Assign the ticket as todo."""
@@ -540,8 +616,9 @@ def assign_todo_handler(
         conn=conn,
         status=Ticket.TODO,
         assigned_to=assigned_to,
-        updated_by=user,
-        current_datetime=current_datetime,
+        updated_by=user(),
+        current_epoch=current_epoch,
+        returning=False,
     )
     _list_tickets(
         conn=conn,
@@ -550,28 +627,30 @@ def assign_todo_handler(
         assigned_to="",
         created_by="",
         format=format,
+        limit=RECENT_TICKETS_LIMIT,
     )
 
 
 def assign_doing_handler(
     args: argparse.Namespace,
     conn: sqlite3.Connection,
-    user: str,
-    current_datetime: datetime.datetime,
+    user: t.Callable[[], str],
+    current_epoch: int,
     config: dict[str, str],
 ) -> None:
     """Assign the ticket as doing."""
     format = args.format
     rowid = args.rowid
-    assigned_to = args.assign_to or user
+    assigned_to = args.assign_to or user()
 
     ticket = Ticket.get(conn=conn, rowid=rowid)
     ticket.assign_to(
         conn=conn,
         status=Ticket.DOING,
         assigned_to=assigned_to,
-        updated_by=user,
-        current_datetime=current_datetime,
+        updated_by=user(),
+        current_epoch=current_epoch,
+        returning=False,
     )
     _list_tickets(
         conn=conn,
@@ -580,14 +659,15 @@ def assign_doing_handler(
         assigned_to="",
         created_by="",
         format=format,
+        limit=RECENT_TICKETS_LIMIT,
     )
 
 
 def mark_as_done_handler(
     args: argparse.Namespace,
     conn: sqlite3.Connection,
-    user: str,
-    current_datetime: datetime.datetime,
+    user: t.Callable[[], str],
+    current_epoch: int,
     config: dict[str, str],
 ) -> None:
     """Mark the ticket as DONE."""
@@ -599,8 +679,9 @@ def mark_as_done_handler(
     ticket.mark_as_done(
         conn=conn,
         notes=notes,
-        updated_by=user,
-        current_datetime=current_datetime,
+        updated_by=user(),
+        current_epoch=current_epoch,
+        returning=False,
     )
     _list_tickets(
         conn=conn,
@@ -609,36 +690,37 @@ def mark_as_done_handler(
         assigned_to="",
         created_by="",
         format=format,
+        limit=RECENT_TICKETS_LIMIT,
     )
 
 
 def sync_handler(
     args: argparse.Namespace,
     conn: sqlite3.Connection,
-    user: str,
-    current_datetime: datetime.datetime,
+    user: t.Callable[[], str],
+    current_epoch: int,
     config: dict[str, str],
 ) -> None:
+    import rich
+
     rich.print("[yellow]A sync feature may be cool for teams")
 
 
-def find_config_path(root_path: pathlib.Path) -> pathlib.Path:
-    """Traverse upwards for an override project path."""
-    config_path = next(root_path.glob(".jire.config"), None)
-
-    if config_path:
-        return config_path
+@functools.cache
+def get_user() -> str:
+    """Get the current user, falling back to the controlling terminal's login."""
+    return os.environ.get("USER") or os.environ.get("LOGNAME") or os.getlogin()
 
-    for path in root_path.parents:
-        config_path = next(path.glob(".jire.config"), None)
 
-        if config_path:
-            break
+def find_config_path(root_path: pathlib.Path) -> pathlib.Path:
+    """Traverse upwards for an override project path."""
+    for path in (root_path, *root_path.parents):
+        config_path = path / ".jire.config"
 
-    if not config_path:
-        raise ConfigError("Missing config file.")
+        if config_path.is_file():
+            return config_path
 
-    return config_path
+    raise ConfigError("Missing config file.")
 
 
 def parse_config_path(path: pathlib.Path | None) -> dict[str, str]:
@@ -648,13 +730,39 @@ def parse_config_path(path: pathlib.Path | None) -> dict[str, str]:
     if not path:
         return config
 
-    resolved_path = path.resolve().absolute()
-    parser = configparser.ConfigParser()
-    parser.read_string(resolved_path.read_text())
+    # Read the [Project] section of the INI file, which holds simple
+    # `key = value` or `key: value` lines
+    sections: dict[str, dict[str, str]] = {}
+    values = None
+    for line in path.read_text().splitlines():
+        line = line.strip()
+
+        if not line or line.startswith(("#", ";")):
+            continue
+
+        if line.startswith("["):
+            if values is not None:
+                break
+
+            if line == "[Project]":
+                values = sections["Project"] = {}
+
+            continue
+
+        if values is None:
+            continue
+
+        parts = re.split(r"[=:]", line, maxsplit=1)
+
+        if len(parts) != 2:
+            raise ConfigError(f"Invalid line: {line}")
+
+        key, value = parts
+        values[key.strip().lower()] = value.strip()
 
     try:
-        config["project"] = parser["Project"]["name"]
-        config["db_path"] = parser["Project"]["db_path"]
+        config["project"] = sections["Project"]["name"]
+        config["db_path"] = sections["Project"]["db_path"]
     except KeyError as ex:
         raise ConfigError(f"{ex}") from ex
 
@@ -705,12 +813,16 @@ def main() -> None:
     try:
         config_path = find_config_path(root_path=cwd_path)
     except ConfigError:
+        import rich
+
         rich.print("[red]Missing config file: Please create .jire.config")
         exit(1)
 
     try:
         config = parse_config_path(path=config_path)
     except ConfigError as ex:
+        import rich
+
         rich.print(f"[red]Invalid config file: {ex}")
         exit(1)
 
@@ -719,15 +831,26 @@ def main() -> None:
     if not db_path.is_absolute():
         db_path = config_path.parent / db_path
 
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.executescript(
+        """
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA cache_size = -64000;
+        PRAGMA busy_timeout = 5000;
+        PRAGMA mmap_size = 134217728;
+        """
+    )
     setup_db(conn=conn)
+    conn.row_factory = Ticket.row_factory
 
     args = parser.parse_args()
-    user = os.getlogin()
     current_datetime = datetime.datetime.now(tz=datetime.UTC)
+    current_epoch = int(current_datetime.timestamp())
 
     args.handler(
-        args, conn=conn, user=user, current_datetime=current_datetime, config=config
+        args, conn=conn, user=get_user, current_epoch=current_epoch, config=config
     )
 
 